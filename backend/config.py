@@ -1,7 +1,8 @@
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Optional
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # KMZ recaches
@@ -17,10 +18,23 @@ class DatasetConfig(BaseSettings):
     body: Optional[str] = None
     use_proxy: bool = True
 
+    # tile_url normalized to {z}/{x}/{y} placeholders, computed once
+    _url_template: Optional[str] = PrivateAttr(default=None)
+
+    def tile_upstream_url(self, z: int, x: int, y: int) -> str:
+        """Upstream URL for one tile via a single precompiled format call."""
+        template = self._url_template
+        if template is None:
+            template = self.tile_url.replace("{col}", "{x}").replace("{row}", "{y}")
+            self._url_template = template
+        return template.format(z=z, x=x, y=y)
+
 
 class Settings(BaseSettings):
     dataset_manifest: Path = Field(default=Path("datasets.json"))
     cache_ttl_seconds: int = Field(default=600)
+    tile_disk_cache_dir: Path = Field(default=Path("/tmp/stellarcanvas-tiles"))
+    tile_disk_cache_bytes: int = Field(default=5 * 1024**3)
 
     model_config = SettingsConfigDict(env_prefix="BACKEND_", env_file=".env", env_file_encoding="utf-8", extra="allow")
 
@@ -28,6 +42,7 @@ class Settings(BaseSettings):
 settings = Settings()
 
 
+@lru_cache(maxsize=1)
 def load_datasets() -> Dict[str, DatasetConfig]:
     import json
 
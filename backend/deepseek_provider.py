@@ -1,17 +1,378 @@
 """DeepSeek API integration for natural language search"""
-import json
+import asyncio
 import logging
+import math
 import os
 import re
 import time
-from typing import Dict, List, Optional, Any
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 
+import ahocorasick
 import httpx
+import numpy as np
+import orjson
+from rapidfuzz.distance import DamerauLevenshtein
+
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:  # pragma: no cover - numba is an optional accelerator
+    _HAS_NUMBA = False
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+if _HAS_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def _score_kernel(body_codes, body_code, no_body_bonus, base_scores,
+                      type_mask, diameters, size_large, size_small):
+        """Fused body/type/size scoring + argmax in one native pass."""
+        best_idx = -1
+        best_score = 0
+        for i in range(body_codes.shape[0]):
+            score = base_scores[i]
+            if body_code >= 0:
+                if body_codes[i] == body_code:
+                    score += 40
+            elif no_body_bonus:
+                score += 10
+            if type_mask[i]:
+                score += 30
+            diameter = diameters[i]
+            if size_large and diameter > 50.0:
+                score += 20
+            elif size_small and diameter < 10.0:
+                score += 20
+            if score > best_score:
+                best_score = score
+                best_idx = i
+        return best_idx, best_score
+
+    def _warm_score_kernel() -> None:
+        """One dummy invocation so the first user query isn't charged compile time."""
+        _score_kernel(
+            np.zeros(1, dtype=np.int8), -1, True,
+            np.zeros(1, dtype=np.int32), np.zeros(1, dtype=np.bool_),
+            np.zeros(1, dtype=np.float32), False, False,
+        )
+else:
+    def _warm_score_kernel() -> None:
+        pass
+
+# Micro-batching: concurrent DeepSeek queries inside a short window are sent
+# as one multi-query prompt — same tokens, one network round-trip
+BATCH_MAX = 8
+BATCH_WINDOW_MS = 20
+
+# JSON extraction from model output that isn't bare JSON
+_JSON_OPEN_TO_CLOSE = {'{': '}', '[': ']'}
+
+
+def _extract_json(content: str) -> Optional[str]:
+    """Return the first balanced JSON object/array in `content`, or None.
+
+    Replaces the old `re.search(r'\\{.*\\}', content, re.DOTALL)` fallback,
+    which recompiled per call and could backtrack badly on long responses.
+    This is a single O(n) pass tracking brace depth and string/escape state.
+    """
+    start = content.find('{')
+    bracket = content.find('[')
+    if start < 0 or (0 <= bracket < start):
+        start = bracket
+    if start < 0:
+        return None
+
+    opener = content[start]
+    closer = _JSON_OPEN_TO_CLOSE[opener]
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(content)):
+        ch = content[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == opener:
+            depth += 1
+        elif ch == closer:
+            depth -= 1
+            if depth == 0:
+                return content[start:i + 1]
+    return None
+
+
+# Normalization for the semantic query cache
+_QUERY_PUNCT_RE = re.compile(r"[^a-z0-9\s]+")
+_QUERY_SPACE_RE = re.compile(r"\s+")
+_QUERY_STOP_WORDS = frozenset({
+    'show', 'me', 'find', 'the', 'a', 'an', 'on', 'in', 'at', 'of',
+    'to', 'please', 'display', 'go', 'take', 'where', 'is', 'are',
+})
+
+
+class SemanticQueryCache:
+    """Two-tier cache of parsed DeepSeek responses.
+
+    Tier 1 is an exact-match LRU on the normalized query. Tier 2 compares
+    stop-word-filtered bag-of-words vectors by cosine similarity, so
+    paraphrases like "show mountains on moon" and "moon mountains" share a
+    single LLM call. Entries expire after a TTL.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 3600.0, threshold: float = 0.92):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        # normalized query -> (timestamp, token_vector, parsed_result)
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, float], Dict]]" = OrderedDict()
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Lowercase, strip punctuation, collapse whitespace."""
+        normalized = _QUERY_PUNCT_RE.sub(' ', query.lower())
+        return _QUERY_SPACE_RE.sub(' ', normalized).strip()
+
+    @staticmethod
+    def _vector(normalized: str) -> Dict[str, float]:
+        """Unit-norm token count vector with stop words removed."""
+        counts = Counter(t for t in normalized.split() if t not in _QUERY_STOP_WORDS)
+        norm = math.sqrt(sum(c * c for c in counts.values()))
+        if not norm:
+            return {}
+        return {token: count / norm for token, count in counts.items()}
+
+    def get(self, query: str) -> Optional[Dict]:
+        now = time.time()
+        normalized = self.normalize(query)
+
+        # Exact-match tier
+        entry = self._entries.get(normalized)
+        if entry is not None:
+            if now - entry[0] <= self.ttl:
+                self._entries.move_to_end(normalized)
+                return entry[2]
+            del self._entries[normalized]
+
+        # Semantic tier: cosine over the stored vectors
+        vector = self._vector(normalized)
+        if not vector:
+            return None
+        best_sim, best_parsed = 0.0, None
+        for key, (stamp, cached_vector, parsed) in list(self._entries.items()):
+            if now - stamp > self.ttl:
+                del self._entries[key]
+                continue
+            sim = sum(weight * cached_vector.get(token, 0.0) for token, weight in vector.items())
+            if sim > best_sim:
+                best_sim, best_parsed = sim, parsed
+        if best_sim >= self.threshold:
+            return best_parsed
+        return None
+
+    def put(self, query: str, parsed_result: Dict) -> None:
+        normalized = self.normalize(query)
+        if not normalized:
+            return
+        self._entries[normalized] = (time.time(), self._vector(normalized), parsed_result)
+        self._entries.move_to_end(normalized)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+class Feature:
+    """Slotted per-feature record: C-level attribute access in the scoring
+    and result-building paths instead of repeated dict.get() hashing, and
+    no per-instance dict overhead."""
+
+    __slots__ = ("name", "name_l", "body", "body_l", "category", "lat", "lon",
+                 "diameter_km", "keywords", "keywords_l")
+
+    def __init__(self, name, name_l, body, body_l, category, lat, lon,
+                 diameter_km, keywords, keywords_l):
+        self.name = name
+        self.name_l = name_l
+        self.body = body
+        self.body_l = body_l
+        self.category = category
+        self.lat = lat
+        self.lon = lon
+        self.diameter_km = diameter_km
+        self.keywords = keywords
+        self.keywords_l = keywords_l
+
+
+class GazetteerIndex:
+    """Structure-of-arrays view over the gazetteer for vectorized scoring.
+
+    The per-request scoring loops used to iterate Python dicts and lowercase
+    the same strings on every query. This pivots the feature list once into
+    parallel NumPy arrays (body/category codes, lowercased names, joined
+    keyword text, diameters) so scoring becomes a handful of vector ops.
+    """
+
+    def __init__(self, features: List[Dict]):
+        self.features = features
+        n = len(features)
+
+        self.body_vocab: Dict[str, int] = {}
+        self.body_codes = np.empty(n, dtype=np.int8)
+        self.by_body: Dict[str, set] = {}
+        self.name_to_indices: Dict[str, List[int]] = {}
+        self.records: List[Feature] = []
+        names_lc = []
+        type_text = []
+        self.diameters = np.full(n, np.nan, dtype=np.float32)
+
+        for i, feature in enumerate(features):
+            # Reuse the interned lowercase fields when the loader provides them
+            body_l = feature.get('_body_l')
+            if body_l is None:
+                body_l = feature.get('body', '').lower()
+            self.body_codes[i] = self.body_vocab.setdefault(body_l, len(self.body_vocab))
+            self.by_body.setdefault(body_l, set()).add(i)
+
+            name_l = feature.get('_name_l')
+            if name_l is None:
+                name_l = feature.get('name', '').lower()
+            names_lc.append(name_l)
+            self.name_to_indices.setdefault(name_l, []).append(i)
+
+            # Category + keywords, lowercased once, for feature-type synonyms
+            keywords_l = feature.get('_kw_l')
+            if keywords_l is None:
+                keywords_l = [kw.lower() for kw in feature.get('keywords', [])]
+            cat_l = feature.get('_cat_l')
+            if cat_l is None:
+                cat_l = feature.get('category', '').lower()
+            type_text.append(cat_l + ' ' + ' '.join(keywords_l))
+
+            diameter = feature.get('diameter_km')
+            if diameter is not None:
+                self.diameters[i] = diameter
+
+            self.records.append(Feature(
+                name=feature.get('name'),
+                name_l=name_l,
+                body=feature.get('body', ''),
+                body_l=body_l,
+                category=feature.get('category', ''),
+                lat=feature.get('lat', 0.0),
+                lon=feature.get('lon', 0.0),
+                diameter_km=diameter,
+                keywords=feature.get('keywords', []),
+                keywords_l=keywords_l,
+            ))
+
+        self.names_lc = np.array(names_lc, dtype=np.str_)
+        self.type_text = np.array(type_text, dtype=np.str_)
+        self._name_automaton: Optional[ahocorasick.Automaton] = None
+        self._trigram_to_ids: Optional[Dict[str, List[int]]] = None
+        self._char_masks: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    @staticmethod
+    def _trigrams(text: str) -> set:
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    @staticmethod
+    def _char_mask(text: str) -> int:
+        mask = 0
+        for ch in text:
+            mask |= 1 << (ord(ch) & 31)
+        return mask
+
+    def _build_fuzzy_index(self) -> None:
+        """Trigram posting lists + per-name character bitmasks, built once."""
+        trigram_to_ids: Dict[str, List[int]] = {}
+        char_masks: List[int] = []
+        for i, name_l in enumerate(self.names_lc):
+            for tri in self._trigrams(str(name_l)):
+                trigram_to_ids.setdefault(tri, []).append(i)
+            char_masks.append(self._char_mask(str(name_l)))
+        self._trigram_to_ids = trigram_to_ids
+        self._char_masks = char_masks
+
+    def fuzzy_name_matches(self, query_l: str, limit: int = 5,
+                           min_similarity: float = 0.75) -> List[Tuple[int, float]]:
+        """Fuzzy-match a query against feature names, prefiltered by trigrams.
+
+        Posting-list union + length/bitmask pruning cuts the candidate set
+        from N to a handful before the (C-implemented) Damerau-Levenshtein
+        pass, so edit-distance cost is only paid on plausible survivors.
+        """
+        if len(query_l) < 3:
+            return []
+        if self._trigram_to_ids is None:
+            self._build_fuzzy_index()
+
+        counts: Counter = Counter()
+        for tri in self._trigrams(query_l):
+            counts.update(self._trigram_to_ids.get(tri, ()))
+        if not counts:
+            return []
+
+        q_mask = self._char_mask(query_l)
+        q_len = len(query_l)
+        matches: List[Tuple[int, float]] = []
+        for idx, _shared in counts.most_common(200):
+            name_l = str(self.names_lc[idx])
+            if query_l in name_l:
+                # Substring survivor: strong match regardless of length gap
+                matches.append((idx, 1.0 if name_l == query_l else 0.9))
+                continue
+            if abs(len(name_l) - q_len) > 4:
+                continue
+            # Allow one missing character class so a substitution typo survives
+            if (q_mask & ~self._char_masks[idx]).bit_count() > 1:
+                continue
+            similarity = DamerauLevenshtein.normalized_similarity(query_l, name_l)
+            if similarity >= min_similarity:
+                matches.append((idx, similarity))
+
+        matches.sort(key=lambda m: m[1], reverse=True)
+        return matches[:limit]
+
+    @property
+    def name_automaton(self) -> ahocorasick.Automaton:
+        """Aho-Corasick automaton over lowercased names, built on first use.
+
+        One ``iter`` pass over a query finds every feature name it mentions
+        in O(len(query)), independent of catalog size.
+        """
+        if self._name_automaton is None:
+            automaton = ahocorasick.Automaton()
+            for name_l in self.name_to_indices:
+                if name_l:
+                    automaton.add_word(name_l, name_l)
+            automaton.make_automaton()
+            self._name_automaton = automaton
+        return self._name_automaton
+
+
+# The gazetteer is loaded once per process, so a single memoized index keyed
+# on the list identity is enough to avoid rebuilding per request.
+_gazetteer_index: Optional[GazetteerIndex] = None
+
+
+def get_gazetteer_index(features: List[Dict]) -> GazetteerIndex:
+    global _gazetteer_index
+    index = _gazetteer_index
+    if index is None or index.features is not features or len(index) != len(features):
+        index = GazetteerIndex(features)
+        _gazetteer_index = index
+        _warm_score_kernel()
+    return index
+
+
 @dataclass
 class SearchResult:
     body: str
@@ -31,7 +392,11 @@ class DeepSeekProvider:
         self.model = os.getenv('DEEPSEEK_MODEL', 'deepseek-chat')
         self.timeout = int(os.getenv('AI_SEARCH_TIMEOUT_MS', '1500')) / 1000
         self.enabled = os.getenv('AI_SEARCH_ENABLE', 'false').lower() == 'true'
-        
+
+        # Availability depends only on env state read above; compute once
+        self._available = self.enabled and bool(self.api_key)
+
+
         # Synonym mapping for feature types and bodies
         self.synonyms = {
             "moon": ["moon", "luna", "selene", "lunar"],
@@ -45,10 +410,56 @@ class DeepSeekProvider:
             "ridge": ["dorsum", "dorsa", "ridge", "ridges"],
             "plain": ["planitia", "plains", "plain"],
         }
-        
+
+        # Reuse parsed results for repeated and paraphrased queries
+        self._sem_cache = SemanticQueryCache()
+
+        # Single-flight: concurrent identical queries share one API call
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # Micro-batcher state, created lazily on the running event loop;
+        # dispatched batches run as tasks held here so the loop can't GC them
+        self._batch_queue: Optional[asyncio.Queue] = None
+        self._batcher_task: Optional[asyncio.Task] = None
+        self._batch_tasks: set = set()
+
+        # Count of queries rejected before reaching the API
+        self._skipped = 0
+
+        # Stable prompt prefixes, rebuilt only when the gazetteer context
+        # (bodies/categories) changes; the query is appended as a suffix
+        self._prompt_ctx_key: Optional[tuple] = None
+        self._prompt_prefix = ""
+        self._batch_prompt_prefix = ""
+
+        # Shared API client, created lazily so pooled TLS connections to
+        # api.deepseek.com are reused across requests
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @staticmethod
+    def _worth_llm_call(query: str) -> bool:
+        """Reject obviously malformed queries before paying for an API call."""
+        q = query.strip()
+        if len(q) < 2 or len(q) > 200:
+            return False
+        if not any(c.isalpha() for c in q):
+            return False
+        # Nothing but stop words can't name a body or feature
+        tokens = [t.strip('.,!?') for t in q.lower().split()]
+        if all(t in _QUERY_STOP_WORDS for t in tokens if t):
+            return False
+        return True
+
     def is_available(self) -> bool:
         """Check if DeepSeek provider is available"""
-        return self.enabled and bool(self.api_key)
+        return self._available
+
+    async def aclose(self) -> None:
+        """Release the shared API client and stop the micro-batcher."""
+        if self._batcher_task is not None and not self._batcher_task.done():
+            self._batcher_task.cancel()
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
         
     async def search(self, query: str, gazetteer_features: List[Dict]) -> Optional[SearchResult]:
         """
@@ -63,7 +474,14 @@ class DeepSeekProvider:
         """
         if not self.is_available():
             return None
-            
+
+        # Cheap pre-checks: don't spend an LLM round-trip on queries that
+        # can't possibly parse to anything useful
+        if not self._worth_llm_call(query):
+            self._skipped += 1
+            logger.info(f"deepseek_skipped={self._skipped}: malformed/stopword-only query: '{query[:80]}'")
+            return None
+
         try:
             start_time = time.time()
             
@@ -72,12 +490,13 @@ class DeepSeekProvider:
             bodies = list(set(f.get('body', '') for f in sample_features))
             categories = list(set(f.get('category', '') for f in sample_features))
             
-            # Create the prompt
-            prompt = self._build_prompt(query, bodies, categories, sample_features)
-            
-            # Call DeepSeek API
-            result = await self._call_deepseek_api(prompt)
-            
+            # Reuse a cached parse for repeated/paraphrased queries
+            result = self._sem_cache.get(query)
+            if result is not None:
+                logger.info(f"Semantic cache hit for query: '{query}'")
+            else:
+                result = await self._parse_query_once(query, bodies, categories, sample_features)
+
             if result:
                 # Find matching feature in gazetteer
                 search_result = self._match_to_gazetteer(result, gazetteer_features)
@@ -98,29 +517,122 @@ class DeepSeekProvider:
             return None
             
         return None
-        
-    def _build_prompt(self, query: str, bodies: List[str], categories: List[str], sample_features: List[Dict]) -> str:
-        """Build the prompt for DeepSeek API"""
-        
-        # Sample feature names for context
-        feature_examples = [f.get('name', '') for f in sample_features[:10] if f.get('name')]
-        
-        prompt = f"""You are helping with planetary feature search. Parse this query and extract key information.
 
-Query: "{query}"
+    async def _parse_query_once(self, query: str, bodies: List[str], categories: List[str],
+                                sample_features: List[Dict]) -> Optional[Dict]:
+        """Call the API with single-flight: concurrent duplicates await one call."""
+        key = SemanticQueryCache.normalize(query)
+        future = self._inflight.get(key)
+        if future is not None:
+            return await future
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._submit_to_batcher(query, bodies, categories, sample_features)
+            if result:
+                self._sem_cache.put(query, result)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(key, None)
 
-Available bodies: {', '.join(bodies)}
+    async def _submit_to_batcher(self, query: str, bodies: List[str], categories: List[str],
+                                 sample_features: List[Dict]) -> Optional[Dict]:
+        """Enqueue a query for the micro-batcher and await its parse."""
+        if self._batch_queue is None:
+            self._batch_queue = asyncio.Queue()
+        if self._batcher_task is None or self._batcher_task.done():
+            self._batcher_task = asyncio.get_running_loop().create_task(self._batcher())
+        future = asyncio.get_running_loop().create_future()
+        self._batch_queue.put_nowait((query, bodies, categories, sample_features, future))
+        return await future
+
+    async def _batcher(self) -> None:
+        """Collect queries for up to BATCH_WINDOW_MS (max BATCH_MAX) and send together."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._batch_queue.get()]
+            deadline = loop.time() + BATCH_WINDOW_MS / 1000
+            while len(batch) < BATCH_MAX:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._batch_queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            # Dispatch without awaiting: the next batch starts collecting
+            # immediately instead of queueing behind this round-trip
+            task = loop.create_task(self._process_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _process_batch(self, batch: List[tuple]) -> None:
+        try:
+            if len(batch) == 1:
+                # Queue sat single-item past the window: plain solo send
+                query, bodies, categories, sample_features, future = batch[0]
+                result = await self._call_deepseek_api(
+                    self._build_prompt(query, bodies, categories, sample_features))
+                if not future.done():
+                    future.set_result(result if isinstance(result, dict) else None)
+                return
+
+            queries = [item[0] for item in batch]
+            _, bodies, categories, sample_features, _ = batch[0]
+            logger.info(f"Micro-batching {len(queries)} DeepSeek queries into one call")
+            parsed = await self._call_deepseek_api(
+                self._build_batch_prompt(queries, bodies, categories, sample_features),
+                max_tokens=200 * len(queries))
+            results = parsed if isinstance(parsed, list) else []
+            for i, item in enumerate(batch):
+                future = item[-1]
+                result = results[i] if i < len(results) and isinstance(results[i], dict) else None
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            # Resolve to None so callers fall through to the keyword provider
+            logger.error(f"DeepSeek batch failed: {e}")
+            for item in batch:
+                future = item[-1]
+                if not future.done():
+                    future.set_result(None)
+
+    def _refresh_prompt_prefixes(self, bodies: List[str], categories: List[str],
+                                 sample_features: List[Dict]) -> None:
+        """(Re)build the stable prompt prefixes when the gazetteer context changes.
+
+        The query goes at the end of the prompt so the prefix is byte-identical
+        across requests — cheaper to build here and eligible for provider-side
+        prompt-prefix caching.
+        """
+        key = (tuple(bodies), tuple(categories))
+        if self._prompt_ctx_key == key:
+            return
+
+        feature_examples = [f.get('name', '') for f in sample_features[:10] if f.get('name')]
+        context = f"""Available bodies: {', '.join(bodies)}
 Available categories: {', '.join(categories)}
-Example features: {', '.join(feature_examples[:5])}
+Example features: {', '.join(feature_examples[:5])}"""
 
-Please respond with a JSON object containing:
-{{
+        schema = """{
     "body": "moon|mars|mercury|null",
-    "feature_type": "crater|mountain|valley|sea|plain|ridge|bay|null", 
+    "feature_type": "crater|mountain|valley|sea|plain|ridge|bay|null",
     "feature_name": "specific feature name if mentioned|null",
     "size_preference": "large|small|null",
     "confidence": 0.0-1.0
-}}
+}"""
+
+        self._prompt_prefix = f"""You are helping with planetary feature search. Parse the query at the end and extract key information.
+
+{context}
+
+Please respond with a JSON object containing:
+{schema}
 
 Examples:
 - "show me large mountains on moon" -> {{"body": "moon", "feature_type": "mountain", "feature_name": null, "size_preference": "large", "confidence": 0.9}}
@@ -128,53 +640,78 @@ Examples:
 - "Mars valleys" -> {{"body": "mars", "feature_type": "valley", "feature_name": null, "size_preference": null, "confidence": 0.8}}
 
 Respond only with valid JSON, no explanations."""
-        
-        return prompt
-        
-    async def _call_deepseek_api(self, prompt: str) -> Optional[Dict]:
+
+        self._batch_prompt_prefix = f"""You are helping with planetary feature search. Parse each query listed at the end and extract key information.
+
+{context}
+
+For every query, produce a JSON object:
+{schema}
+
+Respond only with a valid JSON array of objects, one per query, in order, no explanations."""
+
+        self._prompt_ctx_key = key
+
+    def _build_prompt(self, query: str, bodies: List[str], categories: List[str], sample_features: List[Dict]) -> str:
+        """Build the prompt for DeepSeek API: cached prefix + per-query suffix"""
+        self._refresh_prompt_prefixes(bodies, categories, sample_features)
+        return f'{self._prompt_prefix}\n\nQuery: "{query}"'
+
+    def _build_batch_prompt(self, queries: List[str], bodies: List[str], categories: List[str],
+                            sample_features: List[Dict]) -> str:
+        """Build one prompt covering several queries; the model answers with a JSON array"""
+        self._refresh_prompt_prefixes(bodies, categories, sample_features)
+        numbered = '\n'.join(f'{i + 1}. "{q}"' for i, q in enumerate(queries))
+        return f"{self._batch_prompt_prefix}\n\nQueries ({len(queries)}):\n{numbered}"
+
+    async def _call_deepseek_api(self, prompt: str, max_tokens: int = 200) -> Optional[Any]:
         """Call DeepSeek API with timeout and error handling"""
         if not self.api_key:
             return None
-            
+
         headers = {
             'Authorization': f'Bearer {self.api_key}',
             'Content-Type': 'application/json'
         }
-        
+
         payload = {
             'model': self.model,
             'messages': [
                 {'role': 'user', 'content': prompt}
             ],
-            'max_tokens': 200,
+            'max_tokens': max_tokens,
             'temperature': 0.1
         }
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    'https://api.deepseek.com/v1/chat/completions',
-                    headers=headers,
-                    json=payload
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    content = data['choices'][0]['message']['content'].strip()
-                    
-                    # Parse JSON response
-                    try:
-                        return json.loads(content)
-                    except json.JSONDecodeError:
-                        # Try to extract JSON from response
-                        json_match = re.search(r'\{.*\}', content, re.DOTALL)
-                        if json_match:
-                            return json.loads(json_match.group())
-                        return None
-                else:
-                    logger.error(f"DeepSeek API error: HTTP {response.status_code}")
+            if self._client is None or self._client.is_closed:
+                self._client = httpx.AsyncClient(timeout=self.timeout)
+            response = await self._client.post(
+                'https://api.deepseek.com/v1/chat/completions',
+                headers=headers,
+                json=payload
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                content = data['choices'][0]['message']['content'].strip()
+
+                # Parse JSON response (orjson: C decoder, 2-5x stdlib)
+                try:
+                    return orjson.loads(content)
+                except orjson.JSONDecodeError:
+                    # Try to extract JSON embedded in surrounding prose
+                    snippet = _extract_json(content)
+                    if snippet:
+                        try:
+                            return orjson.loads(snippet)
+                        except orjson.JSONDecodeError:
+                            return None
                     return None
-                    
+            else:
+                logger.error(f"DeepSeek API error: HTTP {response.status_code}")
+                return None
+
         except httpx.TimeoutException:
             logger.warning(f"DeepSeek API timeout after {self.timeout}s")
             return None
@@ -190,65 +727,72 @@ Respond only with valid JSON, no explanations."""
         feature_name = parsed_result.get('feature_name')
         size_preference = parsed_result.get('size_preference')
         confidence = parsed_result.get('confidence', 0.5)
-        
-        # Filter features based on parsed criteria
-        candidates = []
-        
-        for feature in gazetteer_features:
-            score = 0
-            
-            # Body match
-            if body and feature.get('body', '').lower() == body.lower():
-                score += 40
-            elif not body:
-                score += 10  # No body specified, slight bonus
-                
-            # Feature name exact match (highest priority)
-            if feature_name and feature.get('name', '').lower() == feature_name.lower():
-                score += 100
-            elif feature_name and feature_name.lower() in feature.get('name', '').lower():
-                score += 50
-                
-            # Feature type match using synonyms
-            if feature_type:
-                feature_category = feature.get('category', '').lower()
-                feature_keywords = [kw.lower() for kw in feature.get('keywords', [])]
-                
-                # Check if feature type matches category or keywords
-                synonyms_for_type = self.synonyms.get(feature_type, [feature_type])
-                if any(syn in feature_category or syn in ' '.join(feature_keywords) 
-                      for syn in synonyms_for_type):
-                    score += 30
-                    
-            # Size preference (if diameter available)
-            if size_preference and feature.get('diameter_km'):
-                diameter = feature.get('diameter_km')
-                if size_preference == 'large' and diameter > 50:
-                    score += 20
-                elif size_preference == 'small' and diameter < 10:
-                    score += 20
-                    
-            if score > 0:
-                candidates.append({
-                    'feature': feature,
-                    'score': score
-                })
-                
-        if not candidates:
+
+        if not gazetteer_features:
             return None
-            
-        # Sort by score and return best match
-        candidates.sort(key=lambda x: x['score'], reverse=True)
-        best_match = candidates[0]['feature']
-        
+
+        index = get_gazetteer_index(gazetteer_features)
+
+        # Feature name match: exact via hash map, substring vectorized,
+        # then trigram-prefiltered fuzzy matching for near-misses/typos
+        base_scores = np.zeros(len(index), dtype=np.int32)
+        if feature_name:
+            name_lower = feature_name.lower()
+            contains = np.char.find(index.names_lc, name_lower) >= 0
+            exact_indices = index.name_to_indices.get(name_lower)
+            if exact_indices:
+                contains[exact_indices] = False  # exact match takes the higher score
+                base_scores[exact_indices] += 100
+            base_scores[contains] += 50
+            if not exact_indices and not contains.any():
+                for idx, similarity in index.fuzzy_name_matches(name_lower):
+                    base_scores[idx] += int(50 * similarity)
+
+        # Feature type match using synonyms against category + keywords
+        type_mask = np.zeros(len(index), dtype=np.bool_)
+        if feature_type:
+            for syn in self.synonyms.get(feature_type, [feature_type]):
+                type_mask |= np.char.find(index.type_text, syn) >= 0
+
+        body_code = index.body_vocab.get(body.lower(), -1) if body else -1
+        size_large = size_preference == 'large'
+        size_small = size_preference == 'small'
+
+        if _HAS_NUMBA:
+            # Single fused native pass over the SoA arrays (see _score_kernel)
+            best_idx, best_score = _score_kernel(
+                index.body_codes, body_code, body is None, base_scores,
+                type_mask, index.diameters, size_large, size_small,
+            )
+            best_idx, best_score = int(best_idx), int(best_score)
+        else:
+            scores = base_scores.copy()
+            if body_code >= 0:
+                scores += 40 * (index.body_codes == body_code)
+            elif body is None:
+                scores += 10  # No body specified, slight bonus
+            scores[type_mask] += 30
+            # Size preference (if diameter available; NaN compares False)
+            if size_large:
+                scores[index.diameters > 50] += 20
+            elif size_small:
+                scores[index.diameters < 10] += 20
+            best_idx = int(np.argmax(scores))
+            best_score = int(scores[best_idx])
+
+        if best_score <= 0:
+            return None
+
+        best_match = index.records[best_idx]
+
         return SearchResult(
-            body=best_match.get('body', ''),
-            lat=best_match.get('lat', 0.0),
-            lon=best_match.get('lon', 0.0), 
-            layer_id=f"{best_match.get('body', '')}_default",
-            confidence=confidence * (candidates[0]['score'] / 100),
-            tags=best_match.get('keywords', []),
-            feature_name=best_match.get('name')
+            body=best_match.body,
+            lat=best_match.lat,
+            lon=best_match.lon,
+            layer_id=f"{best_match.body}_default",
+            confidence=confidence * (best_score / 100),
+            tags=best_match.keywords,
+            feature_name=best_match.name
         )
 
 
@@ -261,70 +805,107 @@ class KeywordProvider:
             "mars": ["mars", "martian", "red planet"],
             "mercury": ["mercury"],
             "mountain": ["mountain", "mountains", "mons", "montes"],
-            "crater": ["crater", "craters"], 
+            "crater": ["crater", "craters"],
             "valley": ["vallis", "valley", "valleys"],
         }
-        
+
+        # Precomputed synonym lookup tables: classifying a query is then one
+        # dict probe per token (plus bigrams for phrases like "red planet")
+        # instead of scanning every synonym against the query
+        self._token_map: Dict[str, Tuple[str, str]] = {}
+        self._phrase_map: Dict[str, Tuple[str, str]] = {}
+        for key, synonyms in self.synonyms.items():
+            kind = 'body' if key in ('moon', 'mars', 'mercury') else 'type'
+            for syn in synonyms:
+                if ' ' in syn:
+                    self._phrase_map[syn] = (kind, key)
+                else:
+                    self._token_map[syn] = (kind, key)
+
     def search(self, query: str, gazetteer_features: List[Dict]) -> Optional[SearchResult]:
         """Simple keyword-based search through features"""
-        
+
+        if not gazetteer_features:
+            return None
+
         query_lower = query.lower()
-        candidates = []
-        
-        # Extract body and feature type from query
+        index = get_gazetteer_index(gazetteer_features)
+
+        # Extract body and feature type: one hash lookup per token/bigram
         body = None
         feature_type = None
-        
-        for body_key, synonyms in self.synonyms.items():
-            if any(syn in query_lower for syn in synonyms):
-                if body_key in ['moon', 'mars', 'mercury']:
-                    body = body_key
-                else:
-                    feature_type = body_key
-                    
-        # Find matching features
-        for feature in gazetteer_features:
-            score = 0
-            
-            # Body filter
-            if body and feature.get('body', '').lower() != body.lower():
+        tokens = [t.strip('.,!?') for t in query_lower.split()]
+        for i, token in enumerate(tokens):
+            hit = self._token_map.get(token)
+            if hit is None and i + 1 < len(tokens):
+                hit = self._phrase_map.get(f"{token} {tokens[i + 1]}")
+            if hit is None:
                 continue
-                
-            # Name match
-            feature_name = feature.get('name', '').lower()
-            if query_lower in feature_name or feature_name in query_lower:
-                score += 50
-                
-            # Keyword match  
-            keywords = [kw.lower() for kw in feature.get('keywords', [])]
-            if any(query_lower in kw or kw in query_lower for kw in keywords):
+            kind, key = hit
+            if kind == 'body':
+                body = key
+            else:
+                feature_type = key
+
+        # Feature names mentioned in the query, one automaton pass
+        name_scores: Dict[int, float] = {}
+        for _end, name_l in index.name_automaton.iter(query_lower):
+            for idx in index.name_to_indices[name_l]:
+                name_scores[idx] = 1.0
+        if not name_scores:
+            # Partial or misspelled names: trigram-prefiltered fuzzy matching
+            for idx, similarity in index.fuzzy_name_matches(query_lower):
+                name_scores[idx] = similarity
+        name_hits = set(name_scores)
+
+        # Category matches for any synonym of the detected feature type
+        type_hits = set()
+        if feature_type:
+            type_mask = np.zeros(len(index), dtype=bool)
+            for syn in self.synonyms.get(feature_type, [feature_type]):
+                type_mask |= np.char.find(index.type_text, syn) >= 0
+            type_hits = set(np.nonzero(type_mask)[0].tolist())
+
+        candidate_ids = name_hits | type_hits
+        if body:
+            candidate_ids &= index.by_body.get(body, set())
+
+        # Score only the surviving candidates
+        best_idx = None
+        best_score = 0
+        for idx in sorted(candidate_ids):
+            feature = index.records[idx]
+            score = 0
+
+            # Name match, weighted by fuzzy similarity for near-misses
+            if idx in name_hits:
+                score += int(50 * name_scores[idx])
+
+            # Keyword match (pre-lowercased at index build)
+            if any(query_lower in kw or kw in query_lower for kw in feature.keywords_l):
                 score += 25
-                
+
             # Category match
-            if feature_type and feature_type in feature.get('category', '').lower():
+            if idx in type_hits:
                 score += 30
-                
-            if score > 0:
-                candidates.append({
-                    'feature': feature,
-                    'score': score
-                })
-                
-        if not candidates:
+
+            if score > best_score:
+                best_score = score
+                best_idx = idx
+
+        if best_idx is None:
             return None
-            
-        # Return best match
-        candidates.sort(key=lambda x: x['score'], reverse=True)
-        best_match = candidates[0]['feature']
-        
-        logger.info(f"Keyword provider match: '{best_match.get('name')}' with score {candidates[0]['score']}")
-        
+
+        best_match = index.records[best_idx]
+
+        logger.info(f"Keyword provider match: '{best_match.name}' with score {best_score}")
+
         return SearchResult(
-            body=best_match.get('body', ''),
-            lat=best_match.get('lat', 0.0),
-            lon=best_match.get('lon', 0.0),
-            layer_id=f"{best_match.get('body', '')}_default", 
+            body=best_match.body,
+            lat=best_match.lat,
+            lon=best_match.lon,
+            layer_id=f"{best_match.body}_default",
             confidence=0.7,
-            tags=best_match.get('keywords', []),
-            feature_name=best_match.get('name')
+            tags=best_match.keywords,
+            feature_name=best_match.name
         )
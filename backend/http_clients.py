@@ -0,0 +1,57 @@
+"""Shared httpx clients for the tile and KMZ proxies.
+
+A fresh ``httpx.AsyncClient`` per request forces a new TCP/TLS handshake for
+every tile, and tile browsing fires hundreds of requests at the same upstream
+host within seconds. These app-scoped clients are created once at startup and
+reuse pooled connections for the lifetime of the process.
+"""
+from __future__ import annotations
+
+import httpx
+from fastapi import FastAPI
+
+try:
+    import brotli  # noqa: F401 - needed before advertising br upstream
+    _ACCEPT_ENCODING = "gzip, br"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip"
+
+
+def create_tile_client() -> httpx.AsyncClient:
+    """Client for upstream tile servers: bounded connect, unbounded pool wait.
+
+    HTTP/2 multiplexes the tile fan-out (dozens of concurrent GETs to one
+    origin) over a single connection with compressed headers.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        headers={"Accept-Encoding": _ACCEPT_ENCODING},
+        timeout=httpx.Timeout(30.0, connect=5.0, pool=None),
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100),
+    )
+
+
+def create_kmz_client() -> httpx.AsyncClient:
+    """Client for KMZ downloads: longer read timeout, same pooling."""
+    return httpx.AsyncClient(
+        http2=True,
+        headers={"Accept-Encoding": _ACCEPT_ENCODING},
+        timeout=httpx.Timeout(60.0, connect=5.0, pool=None),
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100),
+    )
+
+
+def install_http_clients(app: FastAPI) -> None:
+    """Register startup/shutdown hooks that manage the shared clients."""
+
+    @app.on_event("startup")
+    async def _open_clients() -> None:
+        app.state.tile_client = create_tile_client()
+        app.state.kmz_client = create_kmz_client()
+
+    @app.on_event("shutdown")
+    async def _close_clients() -> None:
+        await app.state.tile_client.aclose()
+        await app.state.kmz_client.aclose()
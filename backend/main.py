@@ -1,17 +1,22 @@
 from __future__ import annotations
 
-from typing import Dict
+import asyncio
+from typing import Dict, Optional, Tuple
 
 import httpx
 from fastapi import FastAPI, HTTPException, Path, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse, Response
 from pydantic import BaseModel
 
 from config import DatasetConfig, load_datasets
+from http_clients import install_http_clients
 from schemas import DatasetListItem, ViewerConfig
+from tile_cache import tile_cache
 
-app = FastAPI(title="StellarCanvas Tiles", version="0.2.0")
+app = FastAPI(title="StellarCanvas Tiles", version="0.2.0", default_response_class=ORJSONResponse)
+
+install_http_clients(app)
 
 app.add_middleware(
     CORSMiddleware,
@@ -23,11 +28,27 @@ app.add_middleware(
 _DATASETS: Dict[str, DatasetConfig] = load_datasets()
 
 
+@app.on_event("shutdown")
+async def _close_search_providers() -> None:
+    # search_engine is imported lazily by the search routes; only close it
+    # if a search actually loaded it
+    import sys
+
+    engine = sys.modules.get("search_engine")
+    if engine is not None:
+        await engine.aclose()
+
+
 @app.get("/health")
 async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+async def metrics() -> dict:
+    return {"tile_cache": tile_cache.stats()}
+
+
 # ========== SEARCH ENDPOINTS ==========
 
 class SearchRequest(BaseModel):
@@ -46,7 +67,7 @@ async def search_location(request: SearchRequest):
     - {"query": "Show me Olympus Mons"}
     """
     try:
-        from .search_engine import search_features
+        from search_engine import search_features
         result = await search_features(request.query)
         return result
     except Exception as e:
@@ -59,8 +80,8 @@ async def search_location(request: SearchRequest):
 async def test_search():
     """Test endpoint to verify search engine is loaded"""
     try:
-        from .search_engine import search_engine
-        from .deepseek_provider import DeepSeekProvider
+        from search_engine import search_engine
+        from deepseek_provider import DeepSeekProvider
         
         deepseek = DeepSeekProvider()
         return {
@@ -92,6 +113,7 @@ async def test_search():
 
 @app.get("/thumbnail/{body}")
 async def generate_thumbnail(
+    request: Request,
     body: str,
     lat: float = Query(..., ge=-90, le=90),
     lon: float = Query(..., ge=-180, le=180),
@@ -124,7 +146,7 @@ async def generate_thumbnail(
     
     # Proxy the tile
     try:
-        return await proxy_tile(layer_id, zoom, x, y)
+        return await proxy_tile(request, layer_id, zoom, x, y)
     except HTTPException:
         # Return error placeholder
         raise HTTPException(status_code=404, detail="Thumbnail not available")
@@ -132,6 +154,83 @@ async def generate_thumbnail(
 # ========== END SEARCH ENDPOINTS ==========
 
 
+def _tile_cache_control(z: int, upstream_value: Optional[str] = None) -> str:
+    """Lower zoom levels change less frequently, so cache them longer."""
+    if z <= 3:
+        return "public, max-age=604800"  # 1 week
+    if upstream_value:
+        return upstream_value
+    return "public, max-age=86400"
+
+
+# Single-flight: N concurrent misses on one tile produce one upstream fetch
+_tile_inflight: Dict[Tuple[str, int, int, int], asyncio.Future] = {}
+
+# 1x1 transparent PNG served in place of missing tiles
+_PLACEHOLDER_PNG = b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x01\x00\x00\x00\x01\x00\x08\x06\x00\x00\x00\x5c\x72\xa8f\x00\x00\x00\rIDATx\xdac\xf8\x00\x00\x00\x01\x00\x01\x00\x00\x00\x00\x07Nn\x00\x00\x00\x00IEND\xaeB`\x82'
+
+# Tiles are tens of KB; anything larger gets streamed instead of buffered
+_MAX_TILE_BUFFER_BYTES = 1024 * 1024
+
+
+async def _stream_and_close(response: httpx.Response):
+    try:
+        async for chunk in response.aiter_raw():
+            yield chunk
+    finally:
+        await response.aclose()
+
+
+async def _fetch_tile(
+    client: httpx.AsyncClient,
+    upstream: str,
+    layer_id: str,
+    z: int,
+    x: int,
+    y: int,
+):
+    """Fetch one tile from upstream.
+
+    Returns (media_type, body, cache_control) for the normal small-tile case;
+    payloads over _MAX_TILE_BUFFER_BYTES come back as a StreamingResponse so
+    they are never buffered (and never cached).
+    """
+    response = await client.send(client.build_request("GET", upstream), stream=True)
+    try:
+        if response.status_code == 404:
+            # Transparent placeholder for missing tiles; not worth caching long
+            await response.aclose()
+            return "image/png", _PLACEHOLDER_PNG, "public, max-age=3600"
+
+        if response.status_code != 200:
+            await response.aclose()
+            raise HTTPException(status_code=response.status_code, detail=f"Upstream server error: {response.status_code}")
+
+        media_type = response.headers.get("Content-Type", "image/jpeg")
+        cache_control = _tile_cache_control(z, response.headers.get("Cache-Control"))
+        content_length = int(response.headers.get("Content-Length") or 0)
+        if content_length > _MAX_TILE_BUFFER_BYTES:
+            return StreamingResponse(
+                _stream_and_close(response),
+                media_type=media_type,
+                headers={
+                    "Cache-Control": cache_control,
+                    "X-Tile-Source": layer_id,
+                    "X-Tile-Coords": f"{z}/{x}/{y}"
+                },
+            )
+
+        body = await response.aread()
+        await response.aclose()
+        tile_cache.put(layer_id, z, x, y, media_type, body)
+        return media_type, body, cache_control
+    except HTTPException:
+        raise
+    except Exception:
+        await response.aclose()
+        raise
+
+
 @app.get("/viewer/layers", response_model=list[DatasetListItem])
 async def list_layers() -> list[DatasetListItem]:
     return [DatasetListItem(id=cfg.id, title=cfg.title, body=cfg.body) for cfg in _DATASETS.values()]
@@ -167,6 +266,7 @@ async def get_layer_config(
 
 @app.get("/tiles/{layer_id}/{z}/{x}/{y}")
 async def proxy_tile(
+    request: Request,
     layer_id: str,
     z: int,
     x: int,
@@ -181,53 +281,77 @@ async def proxy_tile(
     if z < dataset.min_zoom or z > dataset.max_zoom:
         raise HTTPException(status_code=400, detail=f"Zoom level {z} out of bounds [{dataset.min_zoom}, {dataset.max_zoom}]")
 
-    # Build upstream URL with proper coordinate mapping
-    upstream = dataset.tile_url.replace("{z}", str(z))
-    if "{x}" in upstream:
-        upstream = upstream.replace("{x}", str(x))
-    if "{y}" in upstream:
-        upstream = upstream.replace("{y}", str(y))
-    if "{col}" in upstream:
-        upstream = upstream.replace("{col}", str(x))
-    if "{row}" in upstream:
-        upstream = upstream.replace("{row}", str(y))
+    # Fast path: serve hot tiles from memory, then from the disk tier
+    cached = await tile_cache.aget(layer_id, z, x, y)
+    if cached is not None:
+        cached_type, cached_body = cached
+        return Response(
+            content=cached_body,
+            media_type=cached_type,
+            headers={
+                "Cache-Control": _tile_cache_control(z),
+                "X-Tile-Source": layer_id,
+                "X-Tile-Coords": f"{z}/{x}/{y}",
+                "X-Tile-Cache": "hit",
+            },
+        )
+
+    # Build upstream URL from the precompiled per-dataset template
+    upstream = dataset.tile_upstream_url(z, x, y)
 
     try:
-        async with httpx.AsyncClient(
-            timeout=30.0, 
-            follow_redirects=True,
-            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
-        ) as client:
-            response = await client.get(upstream)
-            
-        if response.status_code == 404:
-            # Return transparent placeholder for missing tiles
-            return Response(
-                content=b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x01\x00\x00\x00\x01\x00\x08\x06\x00\x00\x00\x5c\x72\xa8f\x00\x00\x00\rIDATx\xdac\xf8\x00\x00\x00\x01\x00\x01\x00\x00\x00\x00\x07Nn\x00\x00\x00\x00IEND\xaeB`\x82',
-                media_type="image/png",
-                headers={"Cache-Control": "public, max-age=3600"}
+        # Single-flight: concurrent misses on one tile share a single fetch
+        key = (layer_id, z, x, y)
+        future = _tile_inflight.get(key)
+        if future is not None:
+            shared = await future
+            if shared is not None:
+                media_type, body, cache_control = shared
+                return Response(
+                    content=body,
+                    media_type=media_type,
+                    headers={
+                        "Cache-Control": cache_control,
+                        "X-Tile-Source": layer_id,
+                        "X-Tile-Coords": f"{z}/{x}/{y}"
+                    },
+                )
+            # Oversized tile was streamed by the leader; fetch independently
+
+        future = asyncio.get_running_loop().create_future()
+        _tile_inflight[key] = future
+        try:
+            # Shared pooled client (see http_clients.py) — no per-tile handshake
+            fetched = await _fetch_tile(
+                request.app.state.tile_client, upstream, layer_id, z, x, y
             )
-            
-        if response.status_code != 200:
-            raise HTTPException(status_code=response.status_code, detail=f"Upstream server error: {response.status_code}")
-
-        # Enhanced caching headers
-        cache_control = "public, max-age=86400"
-        if z <= 3:  # Lower zoom levels change less frequently
-            cache_control = "public, max-age=604800"  # 1 week
-        elif response.headers.get("Cache-Control"):
-            cache_control = response.headers["Cache-Control"]
-
-        return StreamingResponse(
-            response.aiter_bytes(),
-            media_type=response.headers.get("Content-Type", "image/jpeg"),
+            if isinstance(fetched, StreamingResponse):
+                # Too large to buffer: can't be shared with coalesced waiters
+                future.set_result(None)
+                return fetched
+            future.set_result(fetched)
+            media_type, body, cache_control = fetched
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception retrieved: with no coalesced waiter the
+            # future is dropped un-awaited and asyncio would log a spurious
+            # "Future exception was never retrieved" traceback. Waiters
+            # already holding the future still receive the exception.
+            future.exception()
+            raise
+        finally:
+            _tile_inflight.pop(key, None)
+
+        return Response(
+            content=body,
+            media_type=media_type,
             headers={
                 "Cache-Control": cache_control,
                 "X-Tile-Source": layer_id,
                 "X-Tile-Coords": f"{z}/{x}/{y}"
             },
         )
-        
+
     except httpx.TimeoutException:
         raise HTTPException(status_code=504, detail="Tile request timeout")
     except httpx.RequestError as e:
@@ -235,15 +359,18 @@ async def proxy_tile(
 
 
 @app.get("/proxy/kmz")
-async def proxy_kmz(url: str = Query(..., description="Remote KMZ URL")) -> StreamingResponse:
-    async with httpx.AsyncClient(timeout=60.0, follow_redirects=True) as client:
-        resp = await client.get(url)
+async def proxy_kmz(request: Request, url: str = Query(..., description="Remote KMZ URL")) -> StreamingResponse:
+    # Stream the archive through without buffering it: KMZ files run to tens
+    # of MB and the old client.get() held the whole body in memory per request.
+    client: httpx.AsyncClient = request.app.state.kmz_client
+    resp = await client.send(client.build_request("GET", url), stream=True)
 
     if resp.status_code != 200:
+        await resp.aclose()
         raise HTTPException(status_code=resp.status_code, detail="Failed to fetch KMZ")
 
     return StreamingResponse(
-        resp.aiter_bytes(),
+        _stream_and_close(resp),
         media_type=resp.headers.get(
             "Content-Type", "application/vnd.google-earth.kmz"
         ),
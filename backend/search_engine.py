@@ -1,21 +1,182 @@
 """Enhanced search engine for planetary features with AI integration"""
-import json
 import logging
+import os
+import sys
 import time
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set, Tuple
 import re
 import asyncio
 
-from .deepseek_provider import DeepSeekProvider, KeywordProvider
+import ahocorasick
+import ijson
+import numpy as np
+import orjson
+
+from deepseek_provider import DeepSeekProvider, KeywordProvider
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Optional numba JIT for the name-scoring kernel; the np.char path below
+# remains the fallback when it is not installed
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+if _HAS_NUMBA:
+    # No parallel=True: at ~12k rows the serial kernel already wins, and a
+    # parallel kernel compiled off the main thread (this module is imported
+    # lazily from the /search route) hangs interpreter shutdown.
+    @njit(cache=True)
+    def _name_score_kernel(buf, off, query, scores):  # pragma: no cover - compiled
+        """Exact (100) / substring (50) name scores over the packed buffer.
+
+        Names are stored lowercased and UTF-8 packed end to end in ``buf``
+        with ``off`` delimiting each one.
+        """
+        qn = query.shape[0]
+        for i in range(off.shape[0] - 1):
+            start = off[i]
+            end = off[i + 1]
+            n = end - start
+            if n < qn:
+                scores[i] = 0
+                continue
+            if n == qn:
+                match = True
+                for j in range(qn):
+                    if buf[start + j] != query[j]:
+                        match = False
+                        break
+                scores[i] = 100 if match else 0
+                continue
+            score = 0
+            for s in range(start, end - qn + 1):
+                hit = True
+                for j in range(qn):
+                    if buf[s + j] != query[j]:
+                        hit = False
+                        break
+                if hit:
+                    score = 50
+                    break
+            scores[i] = score
+
+
+# Optional HEALPix pixelization for the spatial index; without healpy a
+# fixed lat/lon grid provides the same cell-bucketing behaviour
+try:
+    import healpy as hp
+    _HAS_HEALPY = True
+except ImportError:
+    _HAS_HEALPY = False
+
+_HP_NSIDE = 64
+_GRID_DEG = 4  # fallback grid cell size, degrees
+
+# Optional sentence-transformer for the semantic result cache; the hashed
+# bag-of-words fallback keeps the same interface without the 80 MB model
+try:
+    from sentence_transformers import SentenceTransformer
+    _ST_MODEL = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+    _EMB_DIM = _ST_MODEL.get_sentence_embedding_dimension()
+except ImportError:
+    _ST_MODEL = None
+    _EMB_DIM = 256
+
+# parse_query constants, hoisted so nothing is rebuilt per call
+_CAP_RE = re.compile(r'\b[A-Z][a-z]+\b')
+_STOP_WORDS = frozenset({'show', 'me', 'find', 'the', 'on', 'in', 'at', 'crater', 'craters'})
+_BODY_KEYWORDS = {
+    'moon': frozenset({'moon', 'lunar', 'selene'}),
+    'mars': frozenset({'mars', 'martian'}),
+    'mercury': frozenset({'mercury'}),
+    'venus': frozenset({'venus'}),
+}
+
+# Mean radii used to convert surface distances to angles, km
+_BODY_RADIUS_KM = {
+    'moon': 1737.4,
+    'mars': 3389.5,
+    'mercury': 2439.7,
+    'venus': 6051.8,
+}
+
+class SemanticResultCache:
+    """Near-duplicate cache over final search results.
+
+    The exact-match LRU misses paraphrases like "Tycho crater" vs
+    "show me Tycho". Queries are embedded — sentence-transformer when
+    installed, hashed bag-of-words otherwise — and cosine-compared against
+    a FIFO ring of recent (embedding, result) pairs; a similarity above
+    the threshold reuses the stored result without re-running providers.
+    """
+
+    def __init__(self, maxsize: int = 512, threshold: float = 0.92):
+        self.threshold = threshold
+        self._embs = np.zeros((maxsize, _EMB_DIM), dtype=np.float32)
+        self._results: List[Optional[Dict]] = [None] * maxsize
+        self._count = 0
+        self._next = 0
+
+    @staticmethod
+    def _embed(query: str) -> np.ndarray:
+        if _ST_MODEL is not None:
+            return _ST_MODEL.encode([query], normalize_embeddings=True)[0]
+        # Fallback: unit-norm hashed token counts, stop words dropped
+        vec = np.zeros(_EMB_DIM, dtype=np.float32)
+        for token in re.findall(r'[a-z0-9]+', query.lower()):
+            if token not in _STOP_WORDS:
+                vec[zlib.crc32(token.encode()) % _EMB_DIM] += 1.0
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else vec
+
+    def get(self, query: str) -> Optional[Dict]:
+        if self._count == 0:
+            return None
+        sims = self._embs[:self._count] @ self._embed(query)
+        best = int(np.argmax(sims))
+        if sims[best] > self.threshold:
+            return self._results[best]
+        return None
+
+    def put(self, query: str, result: Dict) -> None:
+        self._embs[self._next] = self._embed(query)
+        self._results[self._next] = result
+        self._next = (self._next + 1) % len(self._results)
+        self._count = min(self._count + 1, len(self._results))
+
+
 class FeatureSearchEngine:
     def __init__(self):
         self.features = []
+        self.by_name_exact: Dict[str, List[int]] = {}
+        self.by_body: Dict[str, List[int]] = {}
+        self.token_index: Dict[str, Set[int]] = {}
+        self._names_lc = np.empty(0, dtype=np.str_)
+        self._bodies_lc = np.empty(0, dtype=np.str_)
+        self._cats_lc = np.empty(0, dtype=np.str_)
+        self._kws_lc = np.empty(0, dtype=np.str_)
+        self._lats = np.empty(0, dtype=np.float64)
+        self._lons = np.empty(0, dtype=np.float64)
+        # Original-value columns (SoA): result dicts are materialized from
+        # these on demand instead of copying whole catalog rows
+        self.ids: List[Optional[str]] = []
+        self.names: List[str] = []
+        self.bodies: List[Optional[str]] = []
+        self.cats: List[Optional[str]] = []
+        self.origins: List[Optional[str]] = []
+        self.keywords: List[List[str]] = []
+        self.diameters: List[Optional[float]] = []
+        self._name_buf = np.empty(0, dtype=np.uint8)
+        self._name_off = np.zeros(1, dtype=np.int64)
+        self._spatial_index: Dict[str, Dict] = {}
+        self._ac: Optional[ahocorasick.Automaton] = None
         self.load_features()
     
     def load_features(self):
@@ -27,19 +188,141 @@ class FeatureSearchEngine:
             return
         
         try:
-            with open(features_file, 'r', encoding='utf-8') as f:
-                self.features = json.load(f)
-            logger.info(f"Loaded {len(self.features)} planetary features from {features_file}")
+            body_filter = os.getenv('FEATURE_BODY_FILTER')
+            if body_filter:
+                # Single-body deployment: stream-parse and keep only that
+                # body's rows, so RSS scales with the subset rather than
+                # the whole catalog
+                body_filter = body_filter.lower()
+                with open(features_file, 'rb') as f:
+                    self.features = [
+                        feature for feature in ijson.items(f, 'item', use_float=True)
+                        if (feature.get('body') or '').lower() == body_filter
+                    ]
+                logger.info("FEATURE_BODY_FILTER=%s: kept %d features", body_filter, len(self.features))
+            else:
+                # orjson parses straight from bytes in C; noticeably faster
+                # and leaner than stdlib json for the multi-MB catalog
+                self.features = orjson.loads(features_file.read_bytes())
+
+            # Precompute interned lowercase variants once so the per-query
+            # scoring loops compare existing strings instead of allocating
+            # new lowercased copies for every feature. The original
+            # body/category/origin/keyword values are interned too: the
+            # catalog repeats a handful of distinct values thousands of
+            # times, so duplicates collapse to one object and equality
+            # checks become pointer compares
+            for feature in self.features:
+                body = feature.get('body')
+                if body:
+                    feature['body'] = sys.intern(body)
+                category = feature.get('category')
+                if category:
+                    feature['category'] = sys.intern(category)
+                origin = feature.get('origin')
+                if origin:
+                    feature['origin'] = sys.intern(origin)
+                keywords = feature.get('keywords')
+                if keywords:
+                    feature['keywords'] = [sys.intern(kw) for kw in keywords]
+                feature['_name_l'] = sys.intern(feature.get('name', '').lower())
+                feature['_body_l'] = sys.intern(body.lower() if body else '')
+                feature['_cat_l'] = sys.intern(category.lower() if category else '')
+                feature['_kw_l'] = [sys.intern(kw.lower()) for kw in keywords] if keywords else []
+
+            # Inverted indexes: exact-name and body-filtered lookups become
+            # O(1), and whole-word queries resolve through token_index
+            # without scanning every feature
+            self.by_name_exact = {}
+            self.by_body = {}
+            self.token_index = {}
+            for idx, feature in enumerate(self.features):
+                self.by_name_exact.setdefault(feature['_name_l'], []).append(idx)
+                self.by_body.setdefault(feature['_body_l'], []).append(idx)
+                for token in re.split(r'[^a-z0-9]+', feature['_name_l']):
+                    if token:
+                        self.token_index.setdefault(token, set()).add(idx)
+
+            # Parallel NumPy string columns: the scoring pass in search()
+            # runs as a handful of vectorized np.char calls instead of a
+            # Python loop over every feature
+            self._names_lc = np.array([f['_name_l'] for f in self.features], dtype=np.str_)
+            self._bodies_lc = np.array([f['_body_l'] for f in self.features], dtype=np.str_)
+            self._cats_lc = np.array([f['_cat_l'] for f in self.features], dtype=np.str_)
+            self._kws_lc = np.array(['\n'.join(f['_kw_l']) for f in self.features], dtype=np.str_)
+            self._lats = np.array([f.get('lat') or 0.0 for f in self.features], dtype=np.float64)
+            self._lons = np.array([f.get('lon') or 0.0 for f in self.features], dtype=np.float64)
+
+            # Original-value columns, indexed by feature id: search results
+            # are built from these instead of copying the row dicts
+            self.ids = [f.get('id') for f in self.features]
+            self.names = [f.get('name', '') for f in self.features]
+            self.bodies = [f.get('body') for f in self.features]
+            self.cats = [f.get('category') for f in self.features]
+            self.origins = [f.get('origin') for f in self.features]
+            self.keywords = [f.get('keywords', []) for f in self.features]
+            self.diameters = [f.get('diameter_km') for f in self.features]
+
+            # Lowercased names packed end to end as bytes, for the numba
+            # kernel; a throwaway call triggers (cached) compilation now
+            # rather than on the first query
+            encoded = [f['_name_l'].encode('utf-8') for f in self.features]
+            self._name_off = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(b) for b in encoded], out=self._name_off[1:])
+            self._name_buf = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+            if _HAS_NUMBA:
+                _name_score_kernel(self._name_buf, self._name_off,
+                                   np.frombuffer(b'warm', dtype=np.uint8),
+                                   np.zeros(len(encoded), dtype=np.int32))
+
+            # Spatial index: per-body buckets of feature indices keyed by
+            # HEALPix pixel (or grid cell), so region queries touch only
+            # the cells covering the requested disc
+            self._spatial_index = {}
+            for idx, feature in enumerate(self.features):
+                cell = self._spatial_cell(self._lats[idx], self._lons[idx])
+                self._spatial_index.setdefault(feature['_body_l'], {}).setdefault(cell, []).append(idx)
+
+            # Aho-Corasick automaton over names and keywords: a query that
+            # embeds a feature name ("find olympus mons on mars") matches in
+            # one pass linear in the query length, independent of catalog size
+            word_hits: Dict[str, List[Tuple[int, str]]] = {}
+            for idx, feature in enumerate(self.features):
+                if feature['_name_l']:
+                    word_hits.setdefault(feature['_name_l'], []).append((idx, 'name'))
+                for kw in feature['_kw_l']:
+                    if kw:
+                        word_hits.setdefault(kw, []).append((idx, 'keyword'))
+            self._ac = ahocorasick.Automaton()
+            for word, hits in word_hits.items():
+                self._ac.add_word(word, hits)
+            self._ac.make_automaton()
+
+            logger.info("Loaded %d planetary features from %s", len(self.features), features_file)
             
             # Log feature distribution by body
             body_counts = {}
             for feature in self.features:
                 body = feature.get('body', 'unknown')
                 body_counts[body] = body_counts.get(body, 0) + 1
-            logger.info(f"Feature distribution: {body_counts}")
+            logger.info("Feature distribution: %s", body_counts)
         except Exception as e:
-            logger.error(f"Error loading features from {features_file}: {e}")
+            logger.error("Error loading features from %s: %s", features_file, e)
     
+    def _result_dict(self, idx: int) -> Dict:
+        """Materialize one result row from the column arrays"""
+        return {
+            'id': self.ids[idx],
+            'name': self.names[idx],
+            'body': self.bodies[idx],
+            'category': self.cats[idx],
+            'lat': float(self._lats[idx]),
+            'lon': float(self._lons[idx]),
+            'diameter_km': self.diameters[idx],
+            'origin': self.origins[idx],
+            'keywords': self.keywords[idx],
+        }
+
     def search(self, query: str, body: Optional[str] = None, limit: int = 10) -> List[Dict]:
         """
         Simple text-based search through features
@@ -51,65 +334,160 @@ class FeatureSearchEngine:
         """
         if not self.features:
             return []
-        
+
         query_lower = query.lower()
-        results = []
-        
-        for feature in self.features:
-            score = 0
-            
-            # Filter by body if specified
-            if body and feature.get('body', '').lower() != body.lower():
-                continue
-            
-            # Exact name match (highest priority)
-            if query_lower == feature.get('name', '').lower():
-                score = 100
-            # Name contains query
-            elif query_lower in feature.get('name', '').lower():
-                score = 50
-            # Keyword match
-            elif any(query_lower in kw.lower() for kw in feature.get('keywords', [])):
-                score = 25
-            # Category match
-            elif query_lower in feature.get('category', '').lower():
-                score = 10
-            
-            if score > 0:
-                results.append({**feature, '_match_score': score})
-            
-            if len(results) >= limit * 3:  # Get more for sorting
-                break
-        
-        # Sort by match score
-        results.sort(key=lambda x: x.get('_match_score', 0), reverse=True)
-        return results[:limit]
+        body_lower = body.lower() if body else None
+
+        # O(1) fast path: an exact-name lookup that already fills the page
+        # skips the vectorized scan entirely
+        exact_hits = [
+            idx for idx in self.by_name_exact.get(query_lower, ())
+            if body_lower is None or self.features[idx]['_body_l'] == body_lower
+        ]
+        if len(exact_hits) >= limit:
+            return [{**self._result_dict(idx), '_match_score': 100} for idx in exact_hits[:limit]]
+
+        # Name tiers (exact 100 / substring 50): numba kernel over the packed
+        # byte buffer when available, vectorized np.char otherwise
+        if _HAS_NUMBA and self._name_buf.size:
+            name_scores = np.zeros(len(self.features), dtype=np.int32)
+            _name_score_kernel(
+                self._name_buf, self._name_off,
+                np.frombuffer(query_lower.encode('utf-8'), dtype=np.uint8),
+                name_scores,
+            )
+        else:
+            name_scores = np.where(
+                self._names_lc == query_lower, 100,                      # Exact name match
+                np.where(np.char.find(self._names_lc, query_lower) >= 0, 50, 0),  # Name contains query
+            ).astype(np.int32)
+
+        # Lower tiers stay vectorized; a name hit always outranks them
+        scores = np.where(
+            name_scores > 0, name_scores,
+            np.where(
+                np.char.find(self._kws_lc, query_lower) >= 0, 25,        # Keyword match
+                np.where(np.char.find(self._cats_lc, query_lower) >= 0, 10, 0),  # Category match
+            ),
+        ).astype(np.int32)
+
+        # Automaton pass: feature names/keywords appearing inside a longer
+        # query score as name (50) or keyword (25) hits
+        if self._ac is not None and len(query_lower) >= 3:
+            for _end, hits in self._ac.iter(query_lower):
+                for idx, kind in hits:
+                    hit_score = 50 if kind == 'name' else 25
+                    if hit_score > scores[idx]:
+                        scores[idx] = hit_score
+
+        if body_lower is not None:
+            scores[self._bodies_lc != body_lower] = 0
+
+        matched = int(np.count_nonzero(scores))
+        if matched == 0:
+            return []
+
+        # Top-K via argpartition (no full sort), then order those K by
+        # score with catalog order breaking ties
+        k = min(limit, matched)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((top, -scores[top]))]
+        return [{**self._result_dict(idx), '_match_score': int(scores[idx])} for idx in top]
+
+    @staticmethod
+    def _spatial_cell(lat: float, lon: float):
+        """Cell id for the spatial index: HEALPix pixel or lat/lon grid key"""
+        if _HAS_HEALPY:
+            return int(hp.ang2pix(_HP_NSIDE, np.radians(90.0 - lat), np.radians(lon % 360.0)))
+        return (int((lat + 90.0) // _GRID_DEG), int((lon % 360.0) // _GRID_DEG))
+
+    def search_in_region(self, body: str, lat_center: float, lon_center: float,
+                         radius_km: float, limit: int = 50) -> List[Dict]:
+        """
+        Find features within radius_km of a point on a body's surface
+
+        Only the index cells covering the requested disc are examined, so
+        viewport/nearby queries avoid scanning every feature on the body.
+        Results carry a '_distance_km' field and are ordered nearest-first.
+        """
+        body_lower = body.lower()
+        cells = self._spatial_index.get(body_lower)
+        body_radius = _BODY_RADIUS_KM.get(body_lower)
+        if not cells or not body_radius or radius_km <= 0:
+            return []
+
+        angular_radius = radius_km / body_radius  # radians
+
+        if _HAS_HEALPY:
+            vec = hp.ang2vec(np.radians(90.0 - lat_center), np.radians(lon_center % 360.0))
+            candidate_cells = [int(p) for p in hp.query_disc(_HP_NSIDE, vec, angular_radius, inclusive=True)]
+        else:
+            span_deg = float(np.degrees(angular_radius))
+            lat_lo = int((max(lat_center - span_deg, -90.0) + 90.0) // _GRID_DEG)
+            lat_hi = int((min(lat_center + span_deg, 90.0) + 90.0) // _GRID_DEG)
+            # Longitude span widens toward the poles; near them cover the ring
+            cos_lat = np.cos(np.radians(min(abs(lat_center) + span_deg, 89.0)))
+            lon_span = span_deg / max(float(cos_lat), 1e-3)
+            n_lon = 360 // _GRID_DEG
+            if lon_span >= 180.0:
+                lon_cells = list(range(n_lon))
+            else:
+                first = int(((lon_center - lon_span) % 360.0) // _GRID_DEG)
+                count = int(2 * lon_span // _GRID_DEG) + 2
+                lon_cells = [(first + i) % n_lon for i in range(count)]
+            candidate_cells = [
+                (lat_cell, lon_cell)
+                for lat_cell in range(lat_lo, lat_hi + 1)
+                for lon_cell in lon_cells
+            ]
+
+        candidates = []
+        for cell in candidate_cells:
+            candidates.extend(cells.get(cell, ()))
+        if not candidates:
+            return []
+
+        # Exact great-circle distance for the surviving candidates only
+        idx = np.array(candidates, dtype=np.int64)
+        lat1 = np.radians(lat_center)
+        lon1 = np.radians(lon_center % 360.0)
+        lat2 = np.radians(self._lats[idx])
+        lon2 = np.radians(self._lons[idx] % 360.0)
+        half_dlat = (lat2 - lat1) / 2.0
+        half_dlon = (lon2 - lon1) / 2.0
+        a = np.sin(half_dlat) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(half_dlon) ** 2
+        dist_km = 2.0 * body_radius * np.arcsin(np.minimum(np.sqrt(a), 1.0))
+
+        inside = dist_km <= radius_km
+        idx, dist_km = idx[inside], dist_km[inside]
+        order = np.argsort(dist_km, kind='stable')[:limit]
+        return [
+            {**self._result_dict(i), '_distance_km': float(d)}
+            for i, d in zip(idx[order], dist_km[order])
+        ]
     
-    def parse_query(self, query: str) -> Dict:
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def parse_query(query: str) -> Dict:
         """Extract intent from natural language query"""
         query_lower = query.lower()
-        
-        # Extract body
-        body = None
-        if any(word in query_lower for word in ['moon', 'lunar', 'selene']):
-            body = 'moon'
-        elif any(word in query_lower for word in ['mars', 'martian', 'red planet']):
+
+        # Extract body: one token-set intersection per body instead of
+        # repeated substring scans; "red planet" is the only multi-word alias
+        tokens = set(query_lower.split())
+        body = next((b for b, kws in _BODY_KEYWORDS.items() if tokens & kws), None)
+        if body is None and 'red planet' in query_lower:
             body = 'mars'
-        elif 'mercury' in query_lower:
-            body = 'mercury'
-        elif 'venus' in query_lower:
-            body = 'venus'
-        
+
         # Extract feature name (capitalized words)
-        capitalized = re.findall(r'\b[A-Z][a-z]+\b', query)
+        capitalized = _CAP_RE.findall(query)
         feature_name = ' '.join(capitalized) if capitalized else None
-        
+
         # Extract search term
         search_term = feature_name if feature_name else query_lower
-        
+
         # Remove common words
-        stop_words = ['show', 'me', 'find', 'the', 'on', 'in', 'at', 'crater', 'craters']
-        search_words = [w for w in search_term.split() if w.lower() not in stop_words]
+        search_words = [w for w in search_term.split() if w.lower() not in _STOP_WORDS]
         search_term = ' '.join(search_words) if search_words else search_term
         
         return {
@@ -121,62 +499,169 @@ class FeatureSearchEngine:
 # Global instance (loaded once at startup)
 search_engine = FeatureSearchEngine()
 
+# Provider singletons: constructing these per request redid env reads and
+# synonym-table setup, and lost the DeepSeek connection pool between calls
+_deepseek_provider = DeepSeekProvider()
+_keyword_provider = KeywordProvider()
+
+
+async def aclose() -> None:
+    """Release provider resources (shared API client, batcher task)."""
+    await _deepseek_provider.aclose()
+
+# Single-flight: concurrent identical queries share one in-flight search
+_inflight: Dict[str, asyncio.Future] = {}
+
+# LRU of final results keyed on the normalized query; a hit skips the
+# provider chain entirely
+_RESULT_CACHE: "OrderedDict[str, Dict]" = OrderedDict()
+_RESULT_CACHE_MAX = 1024
+
+# Second chance for paraphrased queries the exact-match LRU misses
+_SEM_RESULT_CACHE = SemanticResultCache()
+
+# Static suggestions for the no-results response, built once
+_NO_RESULT_SUGGESTIONS: Tuple[str, ...] = (
+    'Try: "Show me Tycho crater"',
+    'Try: "Find valleys on Mars"',
+    'Try: "Show me Olympus Mons"',
+    'Try: "Mercury craters"',
+)
+
 async def search_features(query: str) -> Dict:
     """
     Main search function with AI provider fallback - returns formatted result for frontend
-    
+
     Args:
         query: Natural language query (e.g., "Show me Tycho crater on the Moon")
-    
+
     Returns:
         Dict with found status, feature data, and navigation info
     """
+    start_time = time.time()
+    key = query.strip().lower()
+
+    cached = _RESULT_CACHE.get(key)
+    if cached is None:
+        cached = _SEM_RESULT_CACHE.get(key)
+    else:
+        _RESULT_CACHE.move_to_end(key)
+    if cached is not None:
+        result = dict(cached)
+        result['search_time_ms'] = (time.time() - start_time) * 1000
+        return result
+
+    future = _inflight.get(key)
+    if future is not None:
+        return await future
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        result, cacheable = await _search_features_impl(query)
+        if cacheable:
+            _RESULT_CACHE[key] = result
+            if len(_RESULT_CACHE) > _RESULT_CACHE_MAX:
+                _RESULT_CACHE.popitem(last=False)
+            _SEM_RESULT_CACHE.put(key, result)
+        future.set_result(result)
+        return result
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        _inflight.pop(key, None)
+
+
+async def _search_features_impl(query: str) -> Tuple[Dict, bool]:
     start_time = time.time()
     provider_used = 'none'
     
-    logger.info(f"Search request: '{query}' (length: {len(query)} chars)")
+    logger.info("Search request: '%s' (length: %d chars)", query, len(query))
     
-    # Initialize providers
-    deepseek_provider = DeepSeekProvider()
-    keyword_provider = KeywordProvider()
-    
-    logger.info(f"Provider status: DeepSeek={deepseek_provider.is_available()}, Keyword=always_available")
+    # Module-level provider singletons (see above)
+    deepseek_provider = _deepseek_provider
+    keyword_provider = _keyword_provider
+
+    deepseek_available = deepseek_provider.is_available()
+    logger.info("Provider status: DeepSeek=%s, Keyword=always_available", deepseek_available)
     
-    # Try DeepSeek provider first
+    # Race both providers instead of serializing DeepSeek-then-keyword: a
+    # confident DeepSeek parse wins as soon as it lands, and the keyword
+    # answer is already in hand when the LLM is slow or comes back empty
     search_result = None
-    if deepseek_provider.is_available():
+    if deepseek_available:
+        logger.info("Racing DeepSeek and keyword search...")
+        deep_task = asyncio.create_task(deepseek_provider.search(query, search_engine.features))
+        kw_task = asyncio.create_task(
+            asyncio.to_thread(keyword_provider.search, query, search_engine.features))
+        pending = {deep_task, kw_task}
+        deepseek_result = None
+        keyword_result = None
         try:
-            logger.info("Attempting DeepSeek search...")
-            search_result = await deepseek_provider.search(query, search_engine.features)
-            if search_result:
-                provider_used = 'deepseek'
-                logger.info(f"DeepSeek success: found '{search_result.feature_name}' with confidence {search_result.confidence}")
-        except Exception as e:
-            logger.warning(f"DeepSeek provider failed: {e}")
-    
-    # Fallback to keyword provider
-    if not search_result:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + deepseek_provider.timeout
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                for task in done:
+                    try:
+                        outcome = task.result()
+                    except Exception as e:
+                        name = 'DeepSeek' if task is deep_task else 'Keyword'
+                        logger.warning("%s provider failed: %s", name, e)
+                        continue
+                    if task is deep_task:
+                        deepseek_result = outcome
+                    else:
+                        keyword_result = outcome
+                # A confident LLM parse ends the race immediately
+                if deepseek_result is not None and deepseek_result.confidence > 0.8:
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+
+        # DeepSeek keeps precedence when both produced a result
+        if deepseek_result:
+            search_result = deepseek_result
+            provider_used = 'deepseek'
+            logger.info("DeepSeek success: found '%s' with confidence %s", search_result.feature_name, search_result.confidence)
+        elif keyword_result:
+            search_result = keyword_result
+            provider_used = 'keyword'
+            logger.info("Keyword success: found '%s'", search_result.feature_name)
+    else:
         try:
             logger.info("Attempting keyword search...")
-            search_result = keyword_provider.search(query, search_engine.features)
+            # Thread offload: the scan is sync and would otherwise block the
+            # event loop for every concurrent request
+            search_result = await asyncio.to_thread(
+                keyword_provider.search, query, search_engine.features)
             if search_result:
                 provider_used = 'keyword'
-                logger.info(f"Keyword success: found '{search_result.feature_name}'")
+                logger.info("Keyword success: found '%s'", search_result.feature_name)
         except Exception as e:
-            logger.warning(f"Keyword provider failed: {e}")
+            logger.warning("Keyword provider failed: %s", e)
     
     # Fallback to original search engine
     if not search_result:
         logger.info("Attempting legacy search...")
         parsed = search_engine.parse_query(query)
-        results = search_engine.search(
+        results = await asyncio.to_thread(
+            search_engine.search,
             parsed['search_term'],
-            body=parsed['body'],
-            limit=10
+            parsed['body'],
+            10,
         )
         if results:
             provider_used = 'legacy'
-            logger.info(f"Legacy search success: {len(results)} results")
+            logger.info("Legacy search success: %d results", len(results))
     else:
         # Convert SearchResult to legacy format
         results = [{
@@ -190,53 +675,56 @@ async def search_features(query: str) -> Dict:
         }]
         
     search_time = time.time() - start_time
-    logger.info(f"Search completed in {search_time*1000:.1f}ms using {provider_used} provider")
+    logger.info("Search completed in %.1fms using %s provider", search_time * 1000, provider_used)
     
     if not results:
-        logger.info(f"No results found for query: '{query}'")
+        logger.info("No results found for query: '%s'", query)
+        # Never cached: a later retry may succeed (e.g. provider back up)
         return {
             'found': False,
             'message': f'No results found for "{query}"',
-            'suggestions': [
-                'Try: "Show me Tycho crater"',
-                'Try: "Find valleys on Mars"',
-                'Try: "Show me Olympus Mons"',
-                'Try: "Mercury craters"'
-            ],
+            'suggestions': _NO_RESULT_SUGGESTIONS,
             'provider': provider_used,
             'search_time_ms': search_time * 1000
-        }
-    
-    # Format primary result
+        }, False
+
+    # Format primary result; hoist the repeated lookups once
     primary = results[0]
-    
-        return {
-            'found': True,
-            'body': primary.get('body'),
-            'center': {
-                'lat': primary.get('lat'),
-                'lon': primary.get('lon')
-            },
-            'feature': {
-                'name': primary.get('name'),
-                'category': primary.get('category'),
-                'diameter_km': primary.get('diameter_km'),
-                'origin': primary.get('origin')
-            },
-            'zoom': 6,
-            'layer': f"{primary.get('body')}_default",
-            'related_features': [
-                {
-                    'name': f.get('name'),
-                    'category': f.get('category'),
-                    'lat': f.get('lat'),
-                    'lon': f.get('lon')
-                }
-                for f in results[1:6]  # Next 5 results
-            ],
-            'total_results': len(results),
-            'provider': provider_used,
-            'search_time_ms': search_time * 1000
-        }
-        
-        logger.info(f"Search success: '{primary.get('name')}' on {primary.get('body')} via {provider_used} provider")
+    p_name = primary.get('name')
+    p_body = primary.get('body')
+    p_lat = primary.get('lat')
+    p_lon = primary.get('lon')
+
+    # Low-confidence DeepSeek parses are not worth pinning in the cache
+    cacheable = not (provider_used == 'deepseek' and search_result and search_result.confidence < 0.5)
+
+    logger.info("Search success: '%s' on %s via %s provider", p_name, p_body, provider_used)
+
+    return {
+        'found': True,
+        'body': p_body,
+        'center': {
+            'lat': p_lat,
+            'lon': p_lon
+        },
+        'feature': {
+            'name': p_name,
+            'category': primary.get('category'),
+            'diameter_km': primary.get('diameter_km'),
+            'origin': primary.get('origin')
+        },
+        'zoom': 6,
+        'layer': f"{p_body}_default",
+        'related_features': [
+            {
+                'name': f.get('name'),
+                'category': f.get('category'),
+                'lat': f.get('lat'),
+                'lon': f.get('lon')
+            }
+            for f in results[1:6]  # Next 5 results
+        ],
+        'total_results': len(results),
+        'provider': provider_used,
+        'search_time_ms': search_time * 1000
+    }, cacheable
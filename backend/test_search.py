@@ -161,4 +161,8 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Logging setup lives here, not in the library modules: basicConfig
+    # reconfigures the root logger and is hostile as an import side effect
+    import logging
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     asyncio.run(main())
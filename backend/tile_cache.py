@@ -0,0 +1,101 @@
+"""Bounded cache of tile bytes keyed by (layer_id, z, x, y).
+
+Low-zoom tiles are requested by every viewer and are tiny, yet each request
+used to go back to upstream. TTLs mirror the Cache-Control we already emit:
+one week for z <= 3, one day otherwise. Below the in-memory LRU sits an
+optional diskcache tier so restarts and cold workers don't re-hammer
+upstream for tiles that were already fetched.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Optional, Tuple
+
+import diskcache
+from cachetools import TTLCache
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+TileKey = Tuple[str, int, int, int]
+TileEntry = Tuple[str, bytes]  # (content_type, body)
+
+
+class TileCache:
+    def __init__(self) -> None:
+        # z <= 3: few tiles, long-lived; higher zooms: bigger, shorter TTL
+        self._base = TTLCache(maxsize=4_096, ttl=604_800)
+        self._hot = TTLCache(maxsize=20_000, ttl=86_400)
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        # Pending disk write-through tasks; the event loop keeps only weak
+        # references, so without this set a write could be GC'd before it runs
+        self._write_tasks: set = set()
+
+        # Persistent tier; disabled when the cache dir isn't writable
+        try:
+            self._disk: Optional[diskcache.Cache] = diskcache.Cache(
+                str(settings.tile_disk_cache_dir),
+                size_limit=settings.tile_disk_cache_bytes,
+            )
+        except Exception as e:
+            logger.warning(f"Tile disk cache disabled: {e}")
+            self._disk = None
+
+    def _bucket(self, z: int) -> TTLCache:
+        return self._base if z <= 3 else self._hot
+
+    @staticmethod
+    def _disk_key(layer_id: str, z: int, x: int, y: int) -> str:
+        return f"{layer_id}/{z}/{x}/{y}"
+
+    async def aget(self, layer_id: str, z: int, x: int, y: int) -> Optional[TileEntry]:
+        """Lookup order: in-memory LRU, then disk (off the event loop)."""
+        entry = self._bucket(z).get((layer_id, z, x, y))
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        if self._disk is not None:
+            entry = await asyncio.to_thread(self._disk.get, self._disk_key(layer_id, z, x, y))
+            if entry is not None:
+                # Promote to memory so the next hit skips the disk
+                self._bucket(z)[(layer_id, z, x, y)] = entry
+                self.disk_hits += 1
+                return entry
+
+        self.misses += 1
+        return None
+
+    def put(self, layer_id: str, z: int, x: int, y: int, content_type: str, body: bytes) -> None:
+        entry = (content_type, body)
+        self._bucket(z)[(layer_id, z, x, y)] = entry
+        if self._disk is not None:
+            # Write-through to disk without blocking the hot path
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self._disk.set(self._disk_key(layer_id, z, x, y), entry)
+            else:
+                task = loop.create_task(
+                    asyncio.to_thread(self._disk.set, self._disk_key(layer_id, z, x, y), entry)
+                )
+                self._write_tasks.add(task)
+                task.add_done_callback(self._write_tasks.discard)
+
+    def stats(self) -> dict:
+        total = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": ((self.hits + self.disk_hits) / total) if total else 0.0,
+            "entries": len(self._base) + len(self._hot),
+        }
+
+
+tile_cache = TileCache()